@@ -0,0 +1,10 @@
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+setup(
+    ext_modules=cythonize(
+        # optional: a failed compile leaves the pure-Python parser in use
+        [Extension("resp_parser", ["src/resp_parser.pyx"], optional=True)],
+        compiler_directives={"language_level": "3"},
+    ),
+)
@@ -1,18 +1,46 @@
+import atexit
+import multiprocessing
+import os
+import sys
 import time
 import asyncio
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
-N_TASKS = 5
+# os.process_cpu_count() honours CPU affinity but only exists on 3.13+
+CPU_WORKERS = getattr(os, "process_cpu_count", os.cpu_count)() or 1
+IO_WORKERS = min(32, CPU_WORKERS + 4)  # same default as ThreadPoolExecutor
+
+CPU_TASKS = CPU_WORKERS  # one task per core so CPU scaling is visible
+IO_TASKS = IO_WORKERS  # more tasks than cores so overlapping waits show up
 WORK = 10**7  # adjust to see CPU differences
 
+# False only on a free-threaded (3.13t+) build running with the GIL disabled
+GIL_ENABLED = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+# Pools are shared by every benchmark so worker start-up is paid only once
+_THREAD_POOL = ThreadPoolExecutor(max_workers=IO_WORKERS)
+_PROC_POOL = None
+_PROC_POOL_FUNC = None  # workload the process pool's workers were set up with
+
+# Set in each worker process by _init_worker
+_WORKER_FUNC = None
+
 
 # ----------------------------
 # Workloads
 # ----------------------------
-def cpu_bound(n=WORK):
+def cpu_bound(n=WORK, closed_form=False):
+    """Sum of squares below n; the generator keeps the interpreter busy on purpose."""
+    if closed_form:
+        return (n - 1) * n * (2 * n - 1) // 6
     return sum(i * i for i in range(n))
 
 
+def cpu_bound_closed_form():
+    """cpu_bound() via the closed form, to compare against the generator loop."""
+    return cpu_bound(closed_form=True)
+
+
 def io_bound():
     time.sleep(1)
     return "done"
@@ -23,12 +51,115 @@ def hybrid():
     return cpu_bound(WORK // 5)
 
 
+CPU_WORKLOADS = (cpu_bound, cpu_bound_closed_form)
+
+
+def n_tasks(func):
+    """Number of tasks each strategy runs for the workload func."""
+    return CPU_TASKS if func in CPU_WORKLOADS else IO_TASKS
+
+
+def _init_worker(func):
+    global _WORKER_FUNC
+    _WORKER_FUNC = func
+
+
+def _call_worker_func(_):
+    return _WORKER_FUNC()
+
+
+def _process_pool(func):
+    """
+    Return the shared ProcessPoolExecutor, with func installed in every worker.
+    The function is pickled once per worker rather than once per task; the
+    pool is only rebuilt when the benchmark moves on to another workload.
+    """
+    global _PROC_POOL, _PROC_POOL_FUNC
+    if _PROC_POOL is not None and _PROC_POOL_FUNC is not func:
+        _shutdown_process_pool()
+    if _PROC_POOL is None:
+        ctx = None
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            # Workers fork from a server that has already imported this module
+            ctx = multiprocessing.get_context("forkserver")
+            ctx.set_forkserver_preload([__name__])
+        _PROC_POOL = ProcessPoolExecutor(
+            max_workers=CPU_WORKERS,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(func,),
+        )
+        _PROC_POOL_FUNC = func
+    return _PROC_POOL
+
+
+def _noop(_):
+    return None
+
+
+def _warm_process_pool(func):
+    """Build the process pool for func and start its workers ahead of timing."""
+    # Workers are spawned on demand, one per submit that finds none idle
+    list(_process_pool(func).map(_noop, range(CPU_WORKERS)))
+
+
+@atexit.register
+def _shutdown_process_pool():
+    global _PROC_POOL, _PROC_POOL_FUNC
+    if _PROC_POOL is not None:
+        _PROC_POOL.shutdown()
+        _PROC_POOL = _PROC_POOL_FUNC = None
+
+
+def _eager_event_loop():
+    loop = asyncio.new_event_loop()
+    # Tasks run synchronously up to their first real suspension point,
+    # skipping a scheduler round-trip per task
+    loop.set_task_factory(asyncio.eager_task_factory)
+    return loop
+
+
+def run_async(coro):
+    """asyncio.run() on an event loop with eager task start."""
+    with asyncio.Runner(loop_factory=_eager_event_loop) as runner:
+        return runner.run(coro)
+
+
+async def _in_executor(pool, func, *args):
+    return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+
+async def _bounded_dispatch(workers, jobs, run_job):
+    """
+    Feed `jobs` job indices to `workers` consumers through a bounded queue.
+    The producer blocks once the queue is full, so at most `workers` executor
+    futures are pending however many jobs there are.
+    """
+    workers = min(workers, jobs)
+    queue = asyncio.Queue(maxsize=workers * 2)
+
+    async def produce():
+        for i in range(jobs):
+            await queue.put(i)
+        for _ in range(workers):
+            await queue.put(None)  # one stop signal per consumer
+
+    async def consume():
+        while (job := await queue.get()) is not None:
+            await run_job(job)
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(produce())
+        for _ in range(workers):
+            tg.create_task(consume())
+
+
 # ----------------------------
 # Sequential
 # ----------------------------
 def sequential(func):
     start = time.time()
-    for _ in range(N_TASKS):
+    for _ in range(n_tasks(func)):
         func()
     return time.time() - start
 
@@ -37,32 +168,24 @@ def sequential(func):
 # Threading
 # ----------------------------
 def threading_run(func):
-    """Use ThreadPoolExecutor instead of manual thread management."""
+    """Use the shared ThreadPoolExecutor instead of manual thread management."""
     start = time.time()
-    with ThreadPoolExecutor(max_workers=N_TASKS) as executor:
-        futures = [executor.submit(func) for _ in range(N_TASKS)]
-        # Wait for all futures to complete
-        for future in futures:
-            future.result()
+    futures = [_THREAD_POOL.submit(func) for _ in range(n_tasks(func))]
+    # Wait for all futures to complete
+    for future in futures:
+        future.result()
     return time.time() - start
 
 
 # ----------------------------
 # Multiprocessing
 # ----------------------------
-def mp_worker(args):
-    func, _ = args
-    return func()
-
-
 def mp_run(func):
-    """Use ProcessPoolExecutor for cleaner multiprocessing."""
+    """Use the shared ProcessPoolExecutor for cleaner multiprocessing."""
     start = time.time()
-    with ProcessPoolExecutor(max_workers=N_TASKS) as executor:
-        futures = [executor.submit(mp_worker, (func, i)) for i in range(N_TASKS)]
-        # Wait for all futures and handle results
-        for future in futures:
-            future.result()
+    executor = _process_pool(func)
+    # Only the task index is pickled; map() re-raises any worker exception
+    list(executor.map(_call_worker_func, range(n_tasks(func))))
     return time.time() - start
 
 
@@ -80,16 +203,12 @@ async def asyncio_worker(func):
 
 
 async def asyncio_run(func):
-    """Use asyncio.gather for cleaner task management."""
+    """Use a TaskGroup for cleaner task management and cancellation."""
     start = time.time()
-    # Create and gather all tasks in one statement
-    results = await asyncio.gather(
-        *[asyncio_worker(func) for _ in range(N_TASKS)], return_exceptions=True
-    )
-    # Handle any exceptions that occurred
-    for result in results:
-        if isinstance(result, Exception):
-            raise result
+    # Any failure cancels the remaining tasks and is raised on exit
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(n_tasks(func)):
+            tg.create_task(asyncio_worker(func))
     return time.time() - start
 
 
@@ -97,23 +216,15 @@ async def asyncio_run(func):
 # Thread + Async (async coros dispatch work to thread pool)
 # ----------------------------
 async def async_thread(func):
-    """Properly sized ThreadPoolExecutor with asyncio."""
-    loop = asyncio.get_running_loop()
-    with ThreadPoolExecutor(max_workers=N_TASKS) as pool:
-        # Use gather with executor futures
-        results = await asyncio.gather(
-            *[loop.run_in_executor(pool, func) for _ in range(N_TASKS)],
-            return_exceptions=True,
-        )
-        # Handle any exceptions
-        for result in results:
-            if isinstance(result, Exception):
-                raise result
+    """Shared, properly sized ThreadPoolExecutor with asyncio."""
+    await _bounded_dispatch(
+        IO_WORKERS, n_tasks(func), lambda _: _in_executor(_THREAD_POOL, func)
+    )
 
 
 def thread_async_run(func):
     start = time.time()
-    asyncio.run(async_thread(func))
+    run_async(async_thread(func))
     return time.time() - start
 
 
@@ -121,23 +232,16 @@ def thread_async_run(func):
 # MP + Async (async dispatch to process pool)
 # ----------------------------
 async def async_mp(func):
-    """Properly sized ProcessPoolExecutor with asyncio."""
-    loop = asyncio.get_running_loop()
-    with ProcessPoolExecutor(max_workers=N_TASKS) as pool:
-        # Use gather with executor futures
-        results = await asyncio.gather(
-            *[loop.run_in_executor(pool, func) for _ in range(N_TASKS)],
-            return_exceptions=True,
-        )
-        # Handle any exceptions
-        for result in results:
-            if isinstance(result, Exception):
-                raise result
+    """Shared, properly sized ProcessPoolExecutor with asyncio."""
+    pool = _process_pool(func)
+    await _bounded_dispatch(
+        CPU_WORKERS, n_tasks(func), lambda i: _in_executor(pool, _call_worker_func, i)
+    )
 
 
 def mp_async_run(func):
     start = time.time()
-    asyncio.run(async_mp(func))
+    run_async(async_mp(func))
     return time.time() - start
 
 
@@ -152,18 +256,26 @@ def benchmark(func, label):
     benchmarks = [
         ("Sequential", lambda: sequential(func)),
         ("Threading", lambda: threading_run(func)),
-        ("Asyncio", lambda: asyncio.run(asyncio_run(func))),
+        ("Asyncio", lambda: run_async(asyncio_run(func))),
         ("Multiproc", lambda: mp_run(func)),
         ("Thread+Async", lambda: thread_async_run(func)),
         ("MP+Async", lambda: mp_async_run(func)),
     ]
 
+    try:
+        _warm_process_pool(func)
+    except Exception:
+        pass  # Multiproc and MP+Async hit and report the same failure
+
     for name, bench_func in benchmarks:
         try:
             result = bench_func()
             results[name] = result
             print(f"{name:12}: {result:.4f}s")
         except Exception as e:
+            # Report the first underlying error rather than the TaskGroup's
+            while isinstance(e, ExceptionGroup):
+                e = e.exceptions[0]
             print(f"{name:12}: Failed - {e}")
             results[name] = None
 
@@ -175,11 +287,15 @@ def benchmark(func, label):
 
 
 if __name__ == "__main__":
-    print("⚡ I/O bound test")
+    gil = "GIL enabled" if GIL_ENABLED else "free-threaded, GIL disabled"
+    print(f"🐍 Python {sys.version.split()[0]} ({gil}), {CPU_WORKERS} workers")
+
+    print("\n⚡ I/O bound test")
     benchmark(io_bound, "I/O-bound")
 
     print("\n🧮 CPU bound test")
     benchmark(cpu_bound, "CPU-bound")
+    benchmark(cpu_bound_closed_form, "CPU-bound (closed form)")
 
     print("\n🔀 Hybrid test")
     benchmark(hybrid, "Hybrid")
@@ -1,62 +1,204 @@
 import asyncio
 import logging
+import os
+import queue
+import signal
+import socket
 import sys
-from message_parser import RESPParser, CommandHandler
+import traceback
+from logging.handlers import QueueHandler, QueueListener
+from message_parser import CommandHandler, HiredisParser, RESPParser, hiredis
+
+try:
+    # Optional: compiled parser with the same API, built from resp_parser.pyx
+    from resp_parser import FastRESPParser
+except ImportError:
+    FastRESPParser = None  # type: ignore[assignment, misc]
+
+try:
+    # Optional: libuv-based event loop, a drop-in replacement for asyncio's
+    import uvloop
+except ImportError:
+    uvloop = None  # type: ignore[assignment]
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
-)
 logger = logging.getLogger(__name__)
 
-
-async def handle_client(reader, writer):
-    client_addr = writer.get_extra_info("peername")
-    logger.info(f"Client connected: {client_addr}")
-
-    parser = RESPParser()
-    handler = CommandHandler()
-
-    try:
-        while True:
-            data = await reader.read(512)
-            if not data:
-                break
-
-            logger.info(f"Received: {data!r} from {client_addr}")
-
+# Large enough for the kernel to queue a whole pipelined batch, so one recv
+# (the transport reads up to 256 KiB at a time) drains many commands
+RECV_BUFFER_SIZE = 256 * 1024
+
+# Fastest available parser; all of them share RESPParser's feed() API
+if FastRESPParser is not None:
+    Parser: type = FastRESPParser
+elif hiredis is not None:
+    Parser = HiredisParser
+else:
+    Parser = RESPParser
+
+
+def setup_logging(level=logging.INFO):
+    """
+    Log through a queue so the stdout writes happen on the listener thread
+    instead of blocking the event loop. Returns the started listener.
+    """
+    log_queue = queue.SimpleQueue()
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[QueueHandler(log_queue)],
+    )
+    listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    listener.start()
+    return listener
+
+
+class RESPProtocol(asyncio.Protocol):
+    """Per-connection protocol: feeds received bytes straight into the parser."""
+
+    def __init__(self):
+        self.parser = Parser()
+        self.handler = CommandHandler()
+        self.transport = None
+        self.client_addr = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.client_addr = transport.get_extra_info("peername")
+        logger.info("Client connected: %s", self.client_addr)
+
+    def data_received(self, data):
+        # Per-message logging is debug only and checked once per chunk
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Received: %r from %s", data, self.client_addr)
+
+        try:
             # Parse commands from the received data
-            commands = parser.feed(data)
-
-            # Process each command
-            for command in commands:
-                logger.info(f"Processing command: {command}")
-                response = await handler.handle_command(command)
-                writer.write(response)
-                await writer.drain()
-                logger.info(f"Sent response: {response!r}")
-
-    except Exception as e:
-        logger.error(f"Error handling client {client_addr}: {e}")
-    finally:
-        writer.close()
-        await writer.wait_closed()
-        logger.info(f"Client disconnected: {client_addr}")
-
-
-async def start_server(host="localhost", port=6379):
-    server = await asyncio.start_server(handle_client, host, port)
+            commands = self.parser.feed(data)
+            if not commands:
+                return  # Partial frame, wait for more data
+
+            if debug:
+                for command in commands:
+                    logger.debug("Processing command: %s", command)
+            # Every handler is synchronous, so the whole chunk is answered
+            # within this callback without ever yielding to the event loop
+            handle = self.handler.handle_command
+            responses = [handle(command) for command in commands]
+        except Exception as e:
+            logger.error("Error handling client %s: %s", self.client_addr, e)
+            self.transport.close()
+            return
+
+        # One write per received chunk instead of one per command. write()
+        # rather than writelines(): on some 3.12 releases the selector
+        # transport's writelines() never calls pause_writing()
+        self.transport.write(b"".join(responses))
+        if debug:
+            logger.debug("Sent responses: %r", responses)
+
+    def pause_writing(self):
+        # The write buffer is above its high-water mark: stop reading until a
+        # client that is not consuming responses catches up
+        self.transport.pause_reading()
+
+    def resume_writing(self):
+        self.transport.resume_reading()
+
+    def connection_lost(self, exc):
+        logger.info("Client disconnected: %s", self.client_addr)
+
+
+async def start_server(host="localhost", port=6379, reuse_port=False):
+    loop = asyncio.get_running_loop()
+    # Not listening yet: the receive buffer must be sized before listen()
+    # for accepted connections to advertise the larger window
+    server = await loop.create_server(
+        RESPProtocol, host, port, start_serving=False, reuse_port=reuse_port
+    )
+    for sock in server.sockets:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_BUFFER_SIZE)
 
     addr = server.sockets[0].getsockname()
-    logger.info(f"Async Redis server listening on {addr[0]}:{addr[1]}")
+    logger.info(
+        "Async Redis server listening on %s:%s (pid %d)", addr[0], addr[1], os.getpid()
+    )
 
     async with server:
         await server.serve_forever()
 
 
-def main():
-    asyncio.run(start_server())
+def serve(reuse_port=False):
+    """Run one event loop serving clients until interrupted."""
+    listener = setup_logging()
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    try:
+        asyncio.run(start_server(reuse_port=reuse_port), loop_factory=loop_factory)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.stop()
+
+
+def main(workers=None):
+    """
+    Serve with one event loop per CPU. Each worker is a forked process with
+    its own SO_REUSEPORT listener, so the kernel spreads connections across
+    them; the parent only supervises.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or not hasattr(os, "fork"):
+        serve()
+        return
+
+    # Fork before any event loop or logging thread exists
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            # Never return into the parent's loop; report a crash and exit
+            try:
+                serve(reuse_port=True)
+            except BaseException:
+                traceback.print_exc()
+                os._exit(1)
+            os._exit(0)
+        children.append(pid)
+
+    listener = setup_logging()
+    logger.info("Started %d workers: %s", workers, children)
+
+    running = set(children)
+    stopping = False
+    failed = 0
+
+    def stop_children(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in running:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    # Ctrl-C as well: the parent forwards it instead of raising
+    # KeyboardInterrupt, so it keeps reaping until every worker is gone
+    signal.signal(signal.SIGTERM, stop_children)
+    signal.signal(signal.SIGINT, stop_children)
+    try:
+        while running:
+            pid, status = os.wait()
+            running.discard(pid)
+            code = os.waitstatus_to_exitcode(status)
+            # Workers killed by our own SIGTERM have stopped cleanly
+            if code != 0 and not (stopping and code == -signal.SIGTERM):
+                failed += 1
+                logger.error("Worker %d exited with status %d", pid, code)
+    finally:
+        listener.stop()
+
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -99,7 +99,7 @@ def handle_client(client_socket, client_address):
     parser = MessageParser(client_socket)
     try:
         while True:
-            request = client_socket.recv(512)
+            request = client_socket.recv(65536)
             if not request:
                 break
 
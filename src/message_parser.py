@@ -1,10 +1,25 @@
 """RESP parser and command handler."""
 
+from functools import lru_cache
 from typing import Optional, List, Tuple
 import logging
 
+try:
+    # Optional: hiredis' C RESP reader (the one redis-py uses)
+    import hiredis
+except ImportError:
+    hiredis = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+# Fixed responses, encoded once at import time
+_PONG = b"+PONG\r\n"
+_NULL_BULK = b"$-1\r\n"
+_EMPTY_ERR = b"-ERR empty command\r\n"
+
+# Bulk strings up to this many bytes go through the encoding cache
+_SHORT_BULK_MAX = 32
+
 
 class RESPParser:
     """
@@ -12,14 +27,29 @@ class RESPParser:
     Handles both RESP protocol and simple text protocol.
     """
 
+    # Consumed bytes are only dropped from the front of the buffer once at
+    # least this many have piled up and they make up over half the buffer
+    COMPACT_THRESHOLD = 4096
+
     def __init__(self):
         self.buffer = bytearray()
+        self._read = 0  # offset of the first unconsumed byte
 
-    def feed(self, data: bytes) -> List[List[str]]:
+    def feed(self, data: bytes) -> List[List[bytes]]:
         """
         Feed raw bytes into the parser and return a list of parsed commands.
         Returns empty list if no complete commands are available yet.
         """
+        if self._read == len(self.buffer):
+            # Everything was consumed, drop it without moving any bytes
+            self.buffer.clear()
+            self._read = 0
+        elif (
+            self._read >= self.COMPACT_THRESHOLD and self._read > len(self.buffer) // 2
+        ):
+            del self.buffer[: self._read]
+            self._read = 0
+
         self.buffer.extend(data)
         commands = []
 
@@ -31,32 +61,31 @@ class RESPParser:
 
         return commands
 
-    def _try_parse(self) -> Optional[List[str]]:
+    def _try_parse(self) -> Optional[List[bytes]]:
         """Try to parse a single command from the buffer."""
-        if not self.buffer:
+        if self._read >= len(self.buffer):
             return None
 
         # Try RESP protocol first
-        if self.buffer[0] == ord("*"):
+        if self.buffer[self._read] == ord("*"):
             return self._parse_resp_array()
 
         # Fallback to simple text protocol (newline-delimited)
         return self._parse_text_protocol()
 
-    def _parse_resp_array(self) -> Optional[List[str]]:
+    def _parse_resp_array(self) -> Optional[List[bytes]]:
         """Parse a RESP array (command with arguments)."""
         # Find first CRLF
-        try:
-            first_crlf = self.buffer.index(b"\r\n")
-        except ValueError:
+        first_crlf = self.buffer.find(b"\r\n", self._read)
+        if first_crlf == -1:
             return None  # Incomplete message
 
         # Parse array length
         try:
-            array_length = int(self.buffer[1:first_crlf])
+            array_length = self._atoi(self._read + 1, first_crlf)
         except (ValueError, IndexError):
             # Malformed array declaration
-            self._consume_bytes(first_crlf + 2)
+            self._consume_to(first_crlf + 2)
             return None
 
         position = first_crlf + 2
@@ -70,10 +99,10 @@ class RESPParser:
             position = new_position
 
         # Successfully parsed complete array
-        self._consume_bytes(position)
+        self._consume_to(position)
         return elements
 
-    def _parse_bulk_string(self, start_pos: int) -> Tuple[Optional[str], int]:
+    def _parse_bulk_string(self, start_pos: int) -> Tuple[Optional[bytes], int]:
         """Parse a RESP bulk string."""
         if start_pos >= len(self.buffer):
             return None, start_pos
@@ -83,20 +112,19 @@ class RESPParser:
             return None, start_pos
 
         # Find the CRLF after the length declaration
-        try:
-            length_end = self.buffer.index(b"\r\n", start_pos)
-        except ValueError:
+        length_end = self.buffer.find(b"\r\n", start_pos)
+        if length_end == -1:
             return None, start_pos
 
         # Parse the length
         try:
-            length = int(self.buffer[start_pos + 1 : length_end])
+            length = self._atoi(start_pos + 1, length_end)
         except ValueError:
             return None, start_pos
 
         if length == -1:
             # Null bulk string
-            return "", length_end + 2
+            return b"", length_end + 2
 
         # Calculate where the string content should be
         content_start = length_end + 2
@@ -105,10 +133,8 @@ class RESPParser:
         if content_end + 2 > len(self.buffer):
             return None, start_pos  # Incomplete message
 
-        # Extract the string content
-        content = self.buffer[content_start:content_end].decode(
-            "utf-8", errors="replace"
-        )
+        # Extract the raw content; handlers work on bytes
+        content = bytes(self.buffer[content_start:content_end])
 
         # Verify CRLF after content
         if self.buffer[content_end : content_end + 2] != b"\r\n":
@@ -116,30 +142,110 @@ class RESPParser:
 
         return content, content_end + 2
 
-    def _parse_text_protocol(self) -> Optional[List[str]]:
+    def _parse_text_protocol(self) -> Optional[List[bytes]]:
         """Parse simple text protocol (space-separated, newline-terminated)."""
-        # Look for newline
-        for delimiter in (b"\r\n", b"\n"):
-            try:
-                end = self.buffer.index(delimiter)
-                line = self.buffer[:end].decode("utf-8", errors="replace").strip()
-                self._consume_bytes(end + len(delimiter))
+        # A single scan for LF covers both "\n" and "\r\n" terminators;
+        # a trailing CR is removed by strip()
+        end = self.buffer.find(b"\n", self._read)
+        if end == -1:
+            return None  # No complete line yet
+
+        line = bytes(self.buffer[self._read : end]).strip()
+        self._consume_to(end + 1)
+
+        if line:
+            return line.split()
+        return None
+
+    def _atoi(self, lo: int, hi: int) -> int:
+        """Parse the ASCII integer in buffer[lo:hi]."""
+        # Array and bulk lengths are almost always a single digit: decode it
+        # in place and skip the slice. Longer values go through int(), which
+        # beats a byte-by-byte Python loop.
+        if hi - lo == 1:
+            digit = self.buffer[lo] - 48
+            if 0 <= digit <= 9:
+                return digit
+        return int(self.buffer[lo:hi])
+
+    def _consume_to(self, position: int):
+        """Mark everything before `position` as consumed."""
+        self._read = position
 
-                if line:
-                    return line.split()
-                return None
-            except ValueError:
-                continue
+    def clear(self):
+        """Clear the internal buffer."""
+        self.buffer.clear()
+        self._read = 0
+
+
+# Element types of an array that RESPParser would parse as-is
+_BYTES_ONLY = frozenset((bytes,))
 
-        return None  # No complete line yet
 
-    def _consume_bytes(self, count: int):
-        """Remove the first `count` bytes from the buffer."""
-        self.buffer = self.buffer[count:]
+def _bulk_arg(arg) -> bytes:
+    """Check one element of a hiredis array the way RESPParser would."""
+    if arg is None:
+        return b""  # Null bulk strings become b"", as with RESPParser
+    if not isinstance(arg, bytes):
+        # Integers, nested arrays and the like are not command arguments
+        raise ValueError("expected RESP bulk strings")
+    return arg
+
+
+class HiredisParser:
+    """
+    RESPParser-compatible wrapper around hiredis.Reader.
+    hiredis only speaks RESP, so a connection that does not open with an
+    array is handed to RESPParser for the simple text protocol.
+    """
+
+    def __init__(self):
+        self._reader = hiredis.Reader()
+        self._inline: Optional[RESPParser] = None
+        self._started = False
+
+    def feed(self, data: bytes) -> List[List[bytes]]:
+        """
+        Feed raw bytes into the parser and return a list of parsed commands.
+        Returns empty list if no complete commands are available yet.
+        """
+        if not self._started:
+            if not data:
+                return []
+            self._started = True
+            if data[:1] != b"*":
+                self._inline = RESPParser()
+
+        if self._inline is not None:
+            return self._inline.feed(data)
+
+        self._reader.feed(data)
+        commands = []
+        while (command := self._reader.gets()) is not False:
+            if command is None:
+                # Null array, an empty command as with RESPParser
+                command = []
+            elif not isinstance(command, list):
+                raise ValueError("expected a RESP array")
+            elif not _BYTES_ONLY.issuperset(map(type, command)):
+                command = [_bulk_arg(arg) for arg in command]
+            commands.append(command)
+
+        return commands
 
     def clear(self):
         """Clear the internal buffer."""
-        self.buffer.clear()
+        self._reader = hiredis.Reader()
+        self._inline = None
+        self._started = False
+
+
+def _encode_bulk(s: bytes) -> bytes:
+    return b"$%d\r\n%b\r\n" % (len(s), s)
+
+
+# Clients tend to repeat the same short ECHO/PING payloads
+_encode_short_bulk = lru_cache(maxsize=256)(_encode_bulk)
 
 
 class RESPEncoder:
@@ -156,47 +262,58 @@ class RESPEncoder:
         return f"-ERR {msg}\r\n".encode("utf-8")
 
     @staticmethod
-    def encode_bulk_string(s: Optional[str]) -> bytes:
+    def encode_bulk_string(s: Optional[bytes]) -> bytes:
         """Encode a bulk string response."""
         if s is None:
-            return b"$-1\r\n"
-        encoded = s.encode("utf-8")
-        return f"${len(encoded)}\r\n".encode("utf-8") + encoded + b"\r\n"
+            return _NULL_BULK
+        if len(s) <= _SHORT_BULK_MAX:
+            return _encode_short_bulk(s)
+        return _encode_bulk(s)
 
 
 class CommandHandler:
     """Handles parsed Redis commands (ECHO and PING only for now)."""
 
-    async def handle_command(self, command: List[str]) -> bytes:
+    def handle_command(self, command: List[bytes]) -> bytes:
         """
         Process a command and return the RESP-encoded response.
         """
         if not command:
-            return RESPEncoder.encode_error("empty command")
+            return _EMPTY_ERR
 
-        cmd_name = command[0].upper()
-        args = command[1:] if len(command) > 1 else []
+        handler = self.DISPATCH.get(command[0])
+        if handler is None:
+            # Mixed-case names miss the table; normalise and retry once
+            cmd_name = command[0].upper()
+            handler = self.DISPATCH.get(cmd_name)
+            if handler is None:
+                name = cmd_name.decode("utf-8", errors="replace")
+                logger.info("Unknown command: %s", name)
+                return RESPEncoder.encode_error(f"unknown command '{name}'")
 
-        if cmd_name == "PING":
-            return await self._handle_ping(args)
-        elif cmd_name == "ECHO":
-            return await self._handle_echo(args)
-        else:
-            logger.info(f"Unknown command: {cmd_name}")
-            return RESPEncoder.encode_error(f"unknown command '{cmd_name}'")
+        return handler(self, command[1:])
 
-    async def _handle_ping(self, args: List[str]) -> bytes:
+    def _handle_ping(self, args: List[bytes]) -> bytes:
         """Handle PING command."""
         if args:
             # PING with message returns the message
             return RESPEncoder.encode_bulk_string(args[0])
         # PING without args returns PONG
-        return RESPEncoder.encode_simple_string("PONG")
+        return _PONG
 
-    async def _handle_echo(self, args: List[str]) -> bytes:
+    def _handle_echo(self, args: List[bytes]) -> bytes:
         """Handle ECHO command."""
         if not args:
             # Empty bulk string for no arguments
             return RESPEncoder.encode_bulk_string(None)
         # Join all arguments with space
-        return RESPEncoder.encode_bulk_string(" ".join(args))
+        return RESPEncoder.encode_bulk_string(b" ".join(args))
+
+    # Keyed on the raw command name; both common spellings are listed so
+    # the usual case needs no upper()
+    DISPATCH = {
+        b"PING": _handle_ping,
+        b"ping": _handle_ping,
+        b"ECHO": _handle_echo,
+        b"echo": _handle_echo,
+    }
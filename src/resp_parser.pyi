@@ -0,0 +1,5 @@
+from typing import List
+
+class FastRESPParser:
+    def feed(self, data: bytes) -> List[List[bytes]]: ...
+    def clear(self) -> None: ...
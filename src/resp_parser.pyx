@@ -0,0 +1,253 @@
+# cython: language_level=3, freethreading_compatible=True
+"""
+Compiled RESP parser.
+
+FastRESPParser is a drop-in replacement for message_parser.RESPParser: same
+feed() API, same List[bytes] commands. RESP arrays are scanned on the raw
+buffer with the GIL released; it is only re-acquired to build the result.
+
+The module keeps no shared mutable state and each parser belongs to one
+connection, so it is declared free-threading compatible: importing it on a
+free-threaded build (Cython 3.1+) leaves the GIL disabled.
+"""
+
+cimport cython
+from cpython.bytearray cimport PyByteArray_AS_STRING, PyByteArray_GET_SIZE
+from cpython.bytes cimport PyBytes_FromStringAndSize
+from libc.stdlib cimport free, malloc, realloc
+from libc.string cimport memchr
+
+# _scan_array() results other than the offset just past the array
+cdef enum:
+    INCOMPLETE = -1  # wait for more data, nothing consumed
+    BAD_HEADER = -2  # malformed array length, header line consumed
+    NO_MEMORY = -3
+
+# Same compaction policy as RESPParser
+cdef Py_ssize_t COMPACT_THRESHOLD = 4096
+
+
+cdef inline Py_ssize_t _find_crlf(
+    const char* buf, Py_ssize_t start, Py_ssize_t end
+) noexcept nogil:
+    """Offset of the first CRLF in buf[start:end], or -1."""
+    cdef const char* p
+    while start < end - 1:
+        p = <const char*>memchr(buf + start, c"\r", end - start - 1)
+        if p == NULL:
+            return -1
+        start = p - buf
+        if buf[start + 1] == c"\n":
+            return start
+        start += 1
+    return -1
+
+
+cdef inline bint _isspace(char ch) noexcept nogil:
+    return ch == c" " or (c"\t" <= ch <= c"\r")
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline bint _atoi(
+    const char* buf, Py_ssize_t lo, Py_ssize_t hi, long long* out
+) noexcept nogil:
+    """Parse the ASCII integer in buf[lo:hi], accepting what int() accepts."""
+    cdef bint neg = False
+    cdef long long val = 0
+    cdef char ch
+
+    # int() ignores surrounding whitespace and takes an optional sign
+    while lo < hi and _isspace(buf[lo]):
+        lo += 1
+    while hi > lo and _isspace(buf[hi - 1]):
+        hi -= 1
+    if lo < hi and (buf[lo] == c"-" or buf[lo] == c"+"):
+        neg = buf[lo] == c"-"
+        lo += 1
+    # Reject empty input and anything that could overflow a long long
+    if lo >= hi or hi - lo > 18:
+        return False
+
+    while lo < hi:
+        ch = buf[lo]
+        if ch < c"0" or ch > c"9":
+            return False
+        val = val * 10 + (ch - c"0")
+        lo += 1
+
+    out[0] = -val if neg else val
+    return True
+
+
+cdef class FastRESPParser:
+    """
+    Redis Serialization Protocol (RESP) parser.
+    Handles both RESP protocol and simple text protocol.
+    """
+
+    cdef bytearray buffer
+    cdef Py_ssize_t _read  # offset of the first unconsumed byte
+    cdef Py_ssize_t* _spans  # (start, end) of each element of the current array
+    cdef Py_ssize_t _capacity  # number of (start, end) pairs _spans can hold
+
+    def __cinit__(self):
+        self.buffer = bytearray()
+        self._read = 0
+        self._capacity = 16
+        self._spans = <Py_ssize_t*>malloc(2 * self._capacity * sizeof(Py_ssize_t))
+        if self._spans == NULL:
+            raise MemoryError()
+
+    def __dealloc__(self):
+        free(self._spans)
+
+    def feed(self, data) -> list:
+        """
+        Feed raw bytes into the parser and return a list of parsed commands.
+        Returns empty list if no complete commands are available yet.
+        """
+        cdef Py_ssize_t size = PyByteArray_GET_SIZE(self.buffer)
+        cdef list commands = []
+
+        if self._read == size:
+            # Everything was consumed, drop it without moving any bytes
+            self.buffer.clear()
+            self._read = 0
+        elif self._read >= COMPACT_THRESHOLD and self._read > size // 2:
+            del self.buffer[: self._read]
+            self._read = 0
+
+        self.buffer.extend(data)
+
+        while True:
+            result = self._try_parse()
+            if result is None:
+                break
+            commands.append(result)
+
+        return commands
+
+    def clear(self):
+        """Clear the internal buffer."""
+        self.buffer.clear()
+        self._read = 0
+
+    cdef list _try_parse(self):
+        """Try to parse a single command from the buffer."""
+        cdef Py_ssize_t size = PyByteArray_GET_SIZE(self.buffer)
+        if self._read >= size:
+            return None
+
+        # Try RESP protocol first
+        if PyByteArray_AS_STRING(self.buffer)[self._read] == c"*":
+            return self._parse_resp_array(size)
+
+        # Fallback to simple text protocol (newline-delimited)
+        return self._parse_text_protocol()
+
+    cdef list _parse_resp_array(self, Py_ssize_t size):
+        """Parse a RESP array (command with arguments)."""
+        # The buffer is private to this parser and not resized until feed()
+        # returns, so the pointer stays valid while the GIL is released
+        cdef const char* buf = PyByteArray_AS_STRING(self.buffer)
+        cdef Py_ssize_t count = 0
+        cdef Py_ssize_t end, i
+        cdef list elements
+
+        with nogil:
+            end = self._scan_array(buf, size, &count)
+
+        if end == NO_MEMORY:
+            raise MemoryError()
+        if end < 0:
+            return None
+
+        elements = []
+        for i in range(count):
+            elements.append(
+                PyBytes_FromStringAndSize(
+                    buf + self._spans[2 * i],
+                    self._spans[2 * i + 1] - self._spans[2 * i],
+                )
+            )
+
+        # Successfully parsed complete array
+        self._read = end
+        return elements
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef Py_ssize_t _scan_array(
+        self, const char* buf, Py_ssize_t size, Py_ssize_t* count
+    ) noexcept nogil:
+        """
+        Record the element spans of the RESP array at the read offset.
+        Returns the offset just past the array, or one of the enum codes.
+        """
+        cdef Py_ssize_t crlf, pos, i, content_start, content_end
+        cdef Py_ssize_t* spans
+        cdef long long array_length, length
+
+        crlf = _find_crlf(buf, self._read, size)
+        if crlf == -1:
+            return INCOMPLETE
+
+        if not _atoi(buf, self._read + 1, crlf, &array_length):
+            # Malformed array declaration
+            self._read = crlf + 2
+            return BAD_HEADER
+
+        pos = crlf + 2
+        i = 0
+        while i < array_length:
+            # Each element is a bulk string: $<length>\r\n<content>\r\n
+            if pos >= size or buf[pos] != c"$":
+                return INCOMPLETE
+            crlf = _find_crlf(buf, pos, size)
+            if crlf == -1 or not _atoi(buf, pos + 1, crlf, &length):
+                return INCOMPLETE
+
+            content_start = crlf + 2
+            if length == -1:
+                # Null bulk string, returned as empty bytes
+                content_end = content_start
+                pos = content_start
+            else:
+                if length < 0 or length > size - content_start - 2:
+                    return INCOMPLETE
+                content_end = content_start + <Py_ssize_t>length
+                if buf[content_end] != c"\r" or buf[content_end + 1] != c"\n":
+                    return INCOMPLETE  # Malformed message
+                pos = content_end + 2
+
+            # Spans grow with the elements actually seen, never with the
+            # declared length, so a bogus header cannot force a huge alloc
+            if i == self._capacity:
+                spans = <Py_ssize_t*>realloc(
+                    self._spans, 4 * self._capacity * sizeof(Py_ssize_t)
+                )
+                if spans == NULL:
+                    return NO_MEMORY
+                self._spans = spans
+                self._capacity *= 2
+
+            self._spans[2 * i] = content_start
+            self._spans[2 * i + 1] = content_end
+            i += 1
+
+        count[0] = i
+        return pos
+
+    cdef list _parse_text_protocol(self):
+        """Parse simple text protocol (space-separated, newline-terminated)."""
+        cdef Py_ssize_t end = self.buffer.find(b"\n", self._read)
+        if end == -1:
+            return None  # No complete line yet
+
+        line = bytes(self.buffer[self._read : end]).strip()
+        self._read = end + 1
+
+        if line:
+            return line.split()
+        return None
@@ -0,0 +1,174 @@
+"""Tests for the RESP parsers and the command handler."""
+
+import pytest
+
+from message_parser import (
+    _EMPTY_ERR,
+    _NULL_BULK,
+    _PONG,
+    _SHORT_BULK_MAX,
+    CommandHandler,
+    HiredisParser,
+    RESPEncoder,
+    RESPParser,
+    _encode_short_bulk,
+    hiredis,
+)
+
+try:
+    from resp_parser import FastRESPParser
+except ImportError:
+    FastRESPParser = None  # type: ignore[assignment, misc]
+
+
+@pytest.fixture(
+    params=[
+        pytest.param(RESPParser, id="python"),
+        pytest.param(
+            FastRESPParser,
+            id="cython",
+            marks=pytest.mark.skipif(
+                FastRESPParser is None, reason="resp_parser is not built"
+            ),
+        ),
+        pytest.param(
+            HiredisParser,
+            id="hiredis",
+            marks=pytest.mark.skipif(hiredis is None, reason="hiredis not installed"),
+        ),
+    ]
+)
+def parser(request):
+    return request.param()
+
+
+def feed_all(parser, chunks):
+    commands = []
+    for chunk in chunks:
+        commands.extend(parser.feed(chunk))
+    return commands
+
+
+ECHO = b"*2\r\n$4\r\nECHO\r\n$5\r\nhello\r\n"
+
+
+def test_single_command(parser):
+    assert parser.feed(ECHO) == [[b"ECHO", b"hello"]]
+
+
+def test_byte_at_a_time(parser):
+    chunks = [ECHO[i : i + 1] for i in range(len(ECHO))]
+    assert feed_all(parser, chunks) == [[b"ECHO", b"hello"]]
+
+
+def test_partial_frame_returns_nothing(parser):
+    assert parser.feed(ECHO[:-3]) == []
+    assert parser.feed(ECHO[-3:]) == [[b"ECHO", b"hello"]]
+
+
+def test_pipelined(parser):
+    data = b"*1\r\n$4\r\nPING\r\n" + ECHO + b"*1\r\n$4\r\nPING\r\n"
+    assert parser.feed(data) == [[b"PING"], [b"ECHO", b"hello"], [b"PING"]]
+
+
+def test_long_pipeline_in_uneven_chunks(parser):
+    # Well past the compaction threshold, split mid-frame
+    data = ECHO * 2000
+    chunks = [data[i : i + 997] for i in range(0, len(data), 997)]
+    assert feed_all(parser, chunks) == [[b"ECHO", b"hello"]] * 2000
+
+
+def test_bulk_string_may_contain_crlf(parser):
+    data = b"*2\r\n$4\r\nECHO\r\n$4\r\na\r\nb\r\n"
+    assert parser.feed(data) == [[b"ECHO", b"a\r\nb"]]
+
+
+def test_null_bulk_string_is_empty_bytes(parser):
+    data = b"*3\r\n$4\r\nECHO\r\n$-1\r\n$1\r\nx\r\n"
+    assert parser.feed(data) == [[b"ECHO", b"", b"x"]]
+
+
+def test_inline_commands(parser):
+    assert parser.feed(b"PING\r\necho a b\n") == [[b"PING"], [b"echo", b"a", b"b"]]
+
+
+def test_inline_lf_then_crlf(parser):
+    assert parser.feed(b"echo a b\nfoo\r\n") == [[b"echo", b"a", b"b"], [b"foo"]]
+
+
+def test_bad_array_header_is_skipped(parser):
+    if isinstance(parser, HiredisParser):
+        pytest.skip("hiredis rejects the stream instead of skipping the line")
+    assert parser.feed(b"*x\r\n") == []
+    assert parser.feed(b"*1\r\n$4\r\nPING\r\n") == [[b"PING"]]
+
+
+def test_null_array_is_empty_command(parser):
+    assert parser.feed(b"*-1\r\n*1\r\n$4\r\nPING\r\n") == [[], [b"PING"]]
+
+
+@pytest.mark.skipif(hiredis is None, reason="hiredis not installed")
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(b"*2\r\n$4\r\nECHO\r\n:5\r\n", id="integer"),
+        pytest.param(b"*2\r\n$4\r\nECHO\r\n*1\r\n$1\r\nx\r\n", id="nested-array"),
+    ],
+)
+def test_hiredis_rejects_non_bulk_elements(data):
+    with pytest.raises(ValueError):
+        HiredisParser().feed(data)
+
+
+@pytest.fixture
+def handler():
+    return CommandHandler()
+
+
+@pytest.mark.parametrize("name", [b"PING", b"ping", b"PiNg"])
+def test_ping_any_case(handler, name):
+    assert handler.handle_command([name]) == b"+PONG\r\n"
+    assert handler.handle_command([name, b"hi"]) == b"$2\r\nhi\r\n"
+
+
+def test_mixed_case_name_is_dispatched_after_upper(handler, monkeypatch):
+    calls = []
+    monkeypatch.setitem(
+        CommandHandler.DISPATCH, b"PING", lambda self, args: calls.append(args)
+    )
+    handler.handle_command([b"PiNg", b"x"])
+    assert calls == [[b"x"]]
+
+
+def test_echo_joins_arguments(handler):
+    assert handler.handle_command([b"ECHO", b"a", b"b"]) == b"$3\r\na b\r\n"
+
+
+def test_unknown_command(handler):
+    assert handler.handle_command([b"foo"]) == b"-ERR unknown command 'FOO'\r\n"
+
+
+def test_empty_command(handler):
+    assert handler.handle_command([]) is _EMPTY_ERR
+
+
+def test_long_payload_skips_encoding_cache(handler):
+    payload = b"x" * 33
+    before = _encode_short_bulk.cache_info()
+    assert handler.handle_command([b"ECHO", payload]) == b"$33\r\n" + payload + b"\r\n"
+    assert _encode_short_bulk.cache_info() == before
+
+
+def test_fixed_responses_are_precomputed(handler):
+    assert handler.handle_command([b"PING"]) is _PONG
+    assert handler.handle_command([b"ECHO"]) is _NULL_BULK
+    assert RESPEncoder.encode_bulk_string(None) is _NULL_BULK
+
+
+def test_short_payloads_hit_encoding_cache():
+    payload = b"y" * _SHORT_BULK_MAX
+    first = RESPEncoder.encode_bulk_string(payload)
+    hits = _encode_short_bulk.cache_info().hits
+    assert RESPEncoder.encode_bulk_string(payload) is first
+    assert _encode_short_bulk.cache_info().hits == hits + 1
+    assert first == b"$32\r\n" + payload + b"\r\n"